@@ -10,42 +10,45 @@ sys.path.append('src')
 import matplotlib
 matplotlib.use('Agg')  # Backend pour sauvegarde sans interface graphique
 import matplotlib.pyplot as plt
+import numpy as np
 
-from fetch_data import load_with_fallback
-from calibration import calibrate_vasicek_mle
-from simulation import run_monte_carlo_simulation
-from visualize import plot_simulation_results, plot_data_overview
+# Simplification des tracés: fusionne les points colinéaires avant rendu
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
+
+from main import run_pipeline
+from visualize import (plot_simulation_results, plot_data_overview, compute_path_summary,
+                       add_sample_paths, as_plot_paths)
 
 def main():
     print("🎨 Génération des graphiques de simulation Monte Carlo Euribor")
     print("=" * 60)
     
     try:
-        # 1. Chargement des données
-        print("📊 Chargement des données...")
-        data, meta = load_with_fallback()
-        print(f"✓ {len(data)} observations chargées depuis {meta['source']}")
-        
-        # 2. Graphique des données historiques
-        print("\n📈 Génération du graphique des données historiques...")
-        plot_data_overview(data, save_path='euribor_data_overview.png')
-        
-        # 3. Calibration du modèle
-        print("\n🔧 Calibration du modèle Vasicek...")
-        params = calibrate_vasicek_mle(data['rate'])
-        print(f"✓ Paramètres: κ={params.kappa:.4f}, θ={params.theta:.4f}, σ={params.sigma:.4f}")
-        
-        # 4. Simulation Monte Carlo
-        print("\n🎲 Simulation Monte Carlo...")
-        paths, stats = run_monte_carlo_simulation(
-            params, 
+        # 1-4. Chargement, calibration et simulation Monte Carlo
+        print("📊 Chargement des données, calibration et simulation...")
+        result = run_pipeline(
+            calibration="mle",
             horizon=252,  # 1 an
             n_paths=2000,
             seed=42,
             method="exact"
         )
+        data, meta = result['data'], result['meta']
+        params, stats = result['params'], result['stats']
+        paths = as_plot_paths(result['paths'])
+        print(f"✓ {len(data)} observations chargées depuis {meta['source']}")
+        print(f"✓ Paramètres: κ={params.kappa:.4f}, θ={params.theta:.4f}, σ={params.sigma:.4f}")
         print(f"✓ {stats['simulation_info']['n_paths']} trajectoires simulées")
         
+        # Graphique des données historiques
+        print("\n📈 Génération du graphique des données historiques...")
+        plot_data_overview(data, save_path='euribor_data_overview.png')
+        
+        # Agrégats calculés une seule fois pour tous les graphiques
+        path_summary = compute_path_summary(paths)
+        
         # 5. Graphique des résultats de simulation
         print("\n📊 Génération du graphique de simulation...")
         plot_simulation_results(
@@ -53,20 +56,21 @@ def main():
             stats, 
             params, 
             n_sample_paths=30,
-            save_path='euribor_simulation_results.png'
+            save_path='euribor_simulation_results.png',
+            path_summary=path_summary,
+            seed=42
         )
         
         # 6. Graphique de quelques trajectoires individuelles
         print("\n�� Génération de trajectoires individuelles...")
-        plt.figure(figsize=(12, 6))
-        time_axis = range(paths.shape[0])
+        fig, ax = plt.subplots(figsize=(12, 6))
+        time_axis = np.arange(paths.shape[1])
         
         # Trajectoires échantillon
-        for i in range(min(10, paths.shape[1])):
-            plt.plot(time_axis, paths[:, i], alpha=0.7, linewidth=1)
+        add_sample_paths(ax, time_axis, paths[:10], alpha=0.7, linewidth=1, rasterized=True)
         
         # Moyenne
-        mean_path = paths.mean(axis=1)
+        mean_path = path_summary['mean_path']
         plt.plot(time_axis, mean_path, 'red', linewidth=3, label='Moyenne')
         
         plt.title('Trajectoires Euribor simulées (échantillon)')
@@ -75,17 +79,18 @@ def main():
         plt.legend()
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
-        plt.savefig('euribor_sample_paths.png', dpi=300, bbox_inches='tight')
+        plt.savefig('euribor_sample_paths.png', dpi=150, bbox_inches='tight')
         plt.close()
         print("✓ Graphique sauvegardé: euribor_sample_paths.png")
         
         # 7. Distribution terminale
         print("\n📊 Génération de la distribution terminale...")
-        terminal_rates = paths[-1]
+        terminal_rates = path_summary['terminal_rates']
         
         plt.figure(figsize=(10, 6))
-        plt.hist(terminal_rates, bins=50, density=True, alpha=0.7, 
-                color='skyblue', edgecolor='black', label='Simulation')
+        hist_counts, hist_edges = path_summary['terminal_hist']
+        plt.bar(hist_edges[:-1], hist_counts, width=np.diff(hist_edges), align='edge',
+                alpha=0.7, color='skyblue', edgecolor='black', label='Simulation')
         
         # Statistiques
         mean_term = terminal_rates.mean()
@@ -102,7 +107,7 @@ def main():
         plt.legend()
         plt.grid(True, alpha=0.3)
         plt.tight_layout()
-        plt.savefig('euribor_terminal_distribution.png', dpi=300, bbox_inches='tight')
+        plt.savefig('euribor_terminal_distribution.png', dpi=150, bbox_inches='tight')
         plt.close()
         print("✓ Graphique sauvegardé: euribor_terminal_distribution.png")
         
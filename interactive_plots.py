@@ -8,17 +8,17 @@ sys.path.append('src')
 
 # Utiliser le backend interactif par défaut
 import matplotlib.pyplot as plt
-from fetch_data import load_with_fallback
-from calibration import calibrate_vasicek_mle
-from simulation import run_monte_carlo_simulation
+import numpy as np
+from main import run_pipeline
+from visualize import add_sample_paths, as_plot_paths
 
 def generate_interactive_plots():
     print("🎨 Génération des graphiques interactifs")
     
     # Chargement et simulation
-    data, _ = load_with_fallback()
-    params = calibrate_vasicek_mle(data['rate'])
-    paths, stats = run_monte_carlo_simulation(params, horizon=252, n_paths=1000, seed=42)
+    result = run_pipeline(calibration="mle", horizon=252, n_paths=1000, seed=42)
+    data, stats = result['data'], result['stats']
+    paths = as_plot_paths(result['paths'])
     
     # 1. Graphique des données historiques
     plt.figure(figsize=(12, 4))
@@ -32,17 +32,20 @@ def generate_interactive_plots():
     plt.show()
     
     # 2. Trajectoires simulées
-    plt.figure(figsize=(12, 6))
-    time_axis = range(paths.shape[0])
+    fig, ax = plt.subplots(figsize=(12, 6))
+    time_axis = np.arange(paths.shape[1])
     
     # Échantillon de trajectoires
-    for i in range(min(20, paths.shape[1])):
-        plt.plot(time_axis, paths[:, i], alpha=0.6, linewidth=0.8)
+    add_sample_paths(ax, time_axis, paths[:20], alpha=0.6, linewidth=0.8)
     
     # Moyenne et percentiles
-    mean_path = paths.mean(axis=1)
-    p05_path = np.percentile(paths, 5, axis=1)
-    p95_path = np.percentile(paths, 95, axis=1)
+    mean_path = paths.mean(axis=0)
+    # Sélection O(N) des ordres 5% / 95% au lieu d'un tri complet
+    k_lo = int(0.05 * paths.shape[0])
+    k_hi = min(int(0.95 * paths.shape[0]), paths.shape[0] - 1)
+    part = np.partition(paths, [k_lo, k_hi], axis=0)
+    p05_path = part[k_lo]
+    p95_path = part[k_hi]
     
     plt.plot(time_axis, mean_path, 'red', linewidth=2, label='Moyenne')
     plt.fill_between(time_axis, p05_path, p95_path, alpha=0.3, color='red', label='IC 90%')
@@ -56,7 +59,7 @@ def generate_interactive_plots():
     plt.show()
     
     # 3. Distribution terminale
-    terminal_rates = paths[-1]
+    terminal_rates = paths[:, -1]
     
     plt.figure(figsize=(10, 6))
     plt.hist(terminal_rates, bins=50, density=True, alpha=0.7, color='skyblue', edgecolor='black')
@@ -80,5 +83,4 @@ def generate_interactive_plots():
     print(f"   • Intervalle 90%: [{stats['terminal']['p05']:.4f}, {stats['terminal']['p95']:.4f}]")
 
 if __name__ == "__main__":
-    import numpy as np
     generate_interactive_plots()
@@ -1,7 +1,6 @@
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from scipy.optimize import minimize
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -17,6 +16,10 @@ class VasicekParams:
         return (f"VasicekParams(κ={self.kappa:.4f}, θ={self.theta:.4f}, "
                 f"σ={self.sigma:.4f}, r0={self.r0:.4f})")
 
+def _as_rate_array(rates) -> np.ndarray:
+    """Série de taux -> tableau float64 contigu (converti une seule fois)"""
+    return np.ascontiguousarray(np.asarray(rates, dtype=np.float64))
+
 def calibrate_vasicek_ols(rates: pd.Series, dt=1/252):
     """
     Calibration Vasicek via régression AR(1):
@@ -27,7 +30,10 @@ def calibrate_vasicek_ols(rates: pd.Series, dt=1/252):
     theta = a / (1 - b)  
     sigma = std(ε) * sqrt(2*kappa / (1 - b²))
     """
-    r = rates.values
+    return _calibrate_vasicek_ols_from_array(_as_rate_array(rates), dt)
+
+def _calibrate_vasicek_ols_from_array(r: np.ndarray, dt=1/252):
+    """Calibration OLS sur un tableau float64 déjà converti"""
     x = r[:-1]  # r_t
     y = r[1:]   # r_{t+1}
     n = len(x)
@@ -35,13 +41,15 @@ def calibrate_vasicek_ols(rates: pd.Series, dt=1/252):
     if n < 10:
         raise ValueError(f"Série trop courte pour calibrer: {n} observations")
     
-    # Régression linéaire: y = a + b*x + ε
-    X = np.column_stack([np.ones(n), x])
-    try:
-        beta = np.linalg.lstsq(X, y, rcond=None)[0]
-        a, b = beta
-    except np.linalg.LinAlgError:
+    # Régression linéaire: y = a + b*x + ε (équations normales, sommes centrées)
+    x_mean = x.mean()
+    y_mean = y.mean()
+    dx = x - x_mean
+    sxx = np.dot(dx, dx)
+    if sxx <= 0:
         raise ValueError("Échec de la régression linéaire")
+    b = np.dot(dx, y - y_mean) / sxx
+    a = y_mean - b * x_mean
     
     # Contraintes sur b pour assurer stabilité
     if b <= 0 or b >= 1:
@@ -74,83 +82,60 @@ def calibrate_vasicek_ols(rates: pd.Series, dt=1/252):
 
 def calibrate_vasicek_mle(rates: pd.Series, dt=1/252):
     """
-    Calibration par maximum de vraisemblance (plus précise)
+    Calibration par maximum de vraisemblance (forme fermée)
+    
+    Sous innovations gaussiennes, la vraisemblance exacte conditionnelle du
+    processus OU est celle de l'AR(1) r_{t+1} = a + b * r_t + ε_t. Ses
+    estimateurs sont donc ceux des moindres carrés pour (a, b), et la
+    variance MLE des résidus (sans correction ddof) pour σ.
     """
-    r = rates.values
+    r = _as_rate_array(rates)
     n = len(r)
     
     if n < 10:
         raise ValueError(f"Série trop courte: {n} observations")
     
-    def neg_log_likelihood(params):
-        kappa, theta, sigma = params
-        if kappa <= 0 or sigma <= 0:
-            return 1e10
-            
-        try:
-            # Calculs pour la vraisemblance exacte du processus d'Ornstein-Uhlenbeck
-            exp_kappa_dt = np.exp(-kappa * dt)
-            var_r = sigma**2 * (1 - exp_kappa_dt**2) / (2 * kappa)
-            
-            if var_r <= 0:
-                return 1e10
-                
-            log_lik = 0
-            for i in range(1, n):
-                mean_r = theta + (r[i-1] - theta) * exp_kappa_dt
-                log_lik += -0.5 * np.log(2 * np.pi * var_r) - 0.5 * (r[i] - mean_r)**2 / var_r
-                
-            return -log_lik
-            
-        except (OverflowError, ZeroDivisionError):
-            return 1e10
-    
-    # Estimation initiale via OLS
-    try:
-        initial_params = calibrate_vasicek_ols(rates, dt)
-        x0 = [initial_params.kappa, initial_params.theta, initial_params.sigma]
-    except:
-        # Valeurs par défaut si OLS échoue
-        x0 = [0.1, rates.mean(), rates.std()]
+    x = r[:-1]  # r_t
+    y = r[1:]   # r_{t+1}
+    x_mean = x.mean()
+    y_mean = y.mean()
     
-    # Optimisation
-    bounds = [(0.001, 10), (rates.min() - 0.01, rates.max() + 0.01), (0.001, 1)]
+    dx = x - x_mean
+    sxx = np.dot(dx, dx)
+    if sxx <= 0:
+        raise ValueError("Série constante, calibration impossible")
     
-    try:
-        result = minimize(neg_log_likelihood, x0, bounds=bounds, method='L-BFGS-B')
-        
-        if result.success:
-            kappa_opt, theta_opt, sigma_opt = result.x
-            return VasicekParams(
-                kappa=kappa_opt,
-                theta=theta_opt,
-                sigma=sigma_opt,
-                r0=r[-1]
-            )
-        else:
-            return calibrate_vasicek_ols(rates, dt)
-            
-    except Exception as e:
-        return calibrate_vasicek_ols(rates, dt)
+    b = np.dot(dx, y - y_mean) / sxx
+    a = y_mean - b * x_mean
+    
+    # b hors de ]0, 1[ : pas de processus OU stationnaire, on retombe sur OLS
+    if b <= 0 or b >= 1:
+        return _calibrate_vasicek_ols_from_array(r, dt)
+    
+    kappa = -np.log(b) / dt
+    theta = a / (1 - b)
+    
+    residuals = y - (a + b * x)
+    sigma = np.sqrt(2 * kappa / (1 - b**2) * np.mean(residuals**2))
+    
+    return VasicekParams(
+        kappa=kappa,
+        theta=theta,
+        sigma=sigma,
+        r0=r[-1]
+    )
 
 def estimate_model_quality(rates: pd.Series, params: VasicekParams, dt=1/252):
     """
     Évalue la qualité de l'ajustement du modèle
     """
-    r = rates.values
-    n = len(r)
+    r = _as_rate_array(rates)
     
     # Calcul des résidus standardisés
     exp_kappa_dt = np.exp(-params.kappa * dt)
     var_r = params.sigma**2 * (1 - exp_kappa_dt**2) / (2 * params.kappa)
     
-    residuals = []
-    for i in range(1, n):
-        mean_r = params.theta + (r[i-1] - params.theta) * exp_kappa_dt
-        residual = (r[i] - mean_r) / np.sqrt(var_r)
-        residuals.append(residual)
-    
-    residuals = np.array(residuals)
+    residuals = (r[1:] - (params.theta + (r[:-1] - params.theta) * exp_kappa_dt)) / np.sqrt(var_r)
     
     return {
         'rmse': np.sqrt(np.mean(residuals**2)),
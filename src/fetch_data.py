@@ -1,6 +1,11 @@
-import io
+import logging
+import os
+import tempfile
+import time
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -14,6 +19,25 @@ CANDIDATE_SERIES = {
 
 HEADERS = {"Accept": "text/csv"}
 
+logger = logging.getLogger(__name__)
+
+# Session partagée: une seule connexion TLS (keep-alive) pour toutes les séries.
+# Retry sur statut 502/503/504 uniquement: un timeout de connexion ou de lecture
+# n'est pas rejoué (sinon chaque URL peut attendre plusieurs fois le timeout)
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_session.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=2, connect=0, read=0, backoff_factor=0.3, status_forcelist=(502, 503, 504)
+)))
+
+# Noms de colonnes acceptés pour la date et la valeur
+DATE_COLUMNS = ("time_period", "date", "time")
+VALUE_COLUMNS = ("OBS_VALUE", "VALUE", "RATE")
+
+def _is_wanted_column(col):
+    """Filtre usecols: ne parse que les colonnes date et valeur"""
+    return col.lower() in DATE_COLUMNS or col.upper() in VALUE_COLUMNS
+
 def fetch_euribor(tenor="3M", last_n=600, timeout=15):
     """
     Récupère les données Euribor via l'API ECB SDW
@@ -24,36 +48,37 @@ def fetch_euribor(tenor="3M", last_n=600, timeout=15):
         url = f"{ECB_BASE}/{dataset}/{keypath}?lastNObservations={last_n}"
         
         try:
-            r = requests.get(url, headers=HEADERS, timeout=timeout)
-            
-            if r.status_code != 200:
-                errors[label] = f"HTTP {r.status_code}"
-                continue
+            # Lecture en flux: pandas parse directement les octets de la réponse
+            with _session.get(url, timeout=timeout, stream=True) as r:
+                if r.status_code != 200:
+                    errors[label] = f"HTTP {r.status_code}"
+                    continue
                 
-            df = pd.read_csv(io.StringIO(r.text))
+                r.raw.decode_content = True
+                # Garde l'en-tête vu par le filtre pour le message d'erreur
+                header = {}
+                def wanted(col):
+                    header[col] = None
+                    return _is_wanted_column(col)
+                df = pd.read_csv(r.raw, usecols=wanted)
             
             # Recherche des colonnes date et valeur
-            date_col = None
-            for col in df.columns:
-                if col.lower() in ("time_period", "date", "time"):
-                    date_col = col
-                    break
-                    
-            val_col = None
-            for col in df.columns:
-                if col.upper() in ("OBS_VALUE", "VALUE", "RATE"):
-                    val_col = col
-                    break
+            lower_cols = {c.lower(): c for c in df.columns}
+            upper_cols = {c.upper(): c for c in df.columns}
+            date_col = next((lower_cols[k] for k in DATE_COLUMNS if k in lower_cols), None)
+            val_col = next((upper_cols[k] for k in VALUE_COLUMNS if k in upper_cols), None)
             
             if not date_col or not val_col:
-                errors[label] = f"Colonnes manquantes. Disponibles: {list(df.columns)}"
+                errors[label] = f"Colonnes manquantes. Disponibles: {list(header)}"
                 continue
                 
             # Nettoyage des données
             out = df[[date_col, val_col]].copy()
             out.columns = ["date", "rate"]
             out["date"] = pd.to_datetime(out["date"])
-            out = out.sort_values("date").dropna()
+            out = out.dropna()
+            if not out["date"].is_monotonic_increasing:
+                out = out.sort_values("date")
             
             # Conversion en décimal si nécessaire
             if out["rate"].max() > 2:
@@ -72,17 +97,44 @@ def fetch_euribor(tenor="3M", last_n=600, timeout=15):
     
     raise RuntimeError(f"Échec récupération ECB pour toutes les séries. Détails: {errors}")
 
-def load_with_fallback(tenor="3M", path_csv="data/sample_euribor3m.csv"):
+def _read_rates_csv(path):
+    """Lit un CSV local date,rate avec types explicites (pas d'inférence)"""
+    return pd.read_csv(path, engine="c", usecols=["date", "rate"],
+                       dtype={"rate": "float64"}, parse_dates=["date"])
+
+def load_with_fallback(tenor="3M", path_csv="data/sample_euribor3m.csv",
+                       cache_csv=None, cache_max_age_days=1.0):
     """
     Charge les données Euribor avec fallback sur fichier CSV local
+    
+    Si cache_csv est fourni (opt-in), un cache de moins de cache_max_age_days
+    jours évite l'appel API; chaque récupération réussie le met à jour.
     """
+    if cache_csv and os.path.exists(cache_csv):
+        age_seconds = time.time() - os.path.getmtime(cache_csv)
+        if age_seconds < cache_max_age_days * 86400:
+            # Cache illisible ou vide: traité comme absent, on repasse par l'API
+            try:
+                df = _read_rates_csv(cache_csv)
+                if df.empty:
+                    raise ValueError("cache vide")
+                return df, {
+                    "source": "cache_csv",
+                    "cache_path": cache_csv,
+                    "cache_age_hours": age_seconds / 3600,
+                    "last_date": str(df["date"].max().date())
+                }
+            except Exception as e:
+                logger.warning("Cache %s ignoré: %s", cache_csv, e)
+    
     try:
         df, meta = fetch_euribor(tenor=tenor)
-        return df, meta
     except Exception as e:
         try:
-            df = pd.read_csv(path_csv, parse_dates=["date"])
-            df = df.sort_values("date").dropna()
+            df = _read_rates_csv(path_csv)
+            df = df.dropna()
+            if not df["date"].is_monotonic_increasing:
+                df = df.sort_values("date")
             return df, {
                 "source": "fallback_csv", 
                 "error_api": str(e),
@@ -90,6 +142,26 @@ def load_with_fallback(tenor="3M", path_csv="data/sample_euribor3m.csv"):
             }
         except Exception as e2:
             raise RuntimeError(f"Impossible de charger les données (API + CSV). API: {e}; CSV: {e2}")
+    
+    # Un échec d'écriture du cache ne doit pas faire perdre les données récupérées.
+    # Écriture dans un fichier temporaire puis os.replace: un lecteur concurrent
+    # ou une interruption ne laisse jamais un cache tronqué
+    if cache_csv:
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_csv) or ".",
+                                            suffix=".tmp")
+            with os.fdopen(fd, "w", newline="") as f:
+                df.to_csv(f, index=False)
+            os.replace(tmp_path, cache_csv)
+            tmp_path = None
+        except OSError as e:
+            logger.warning("Écriture du cache %s impossible: %s", cache_csv, e)
+            meta["cache_error"] = str(e)
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return df, meta
 
 if __name__ == "__main__":
     # Test du module
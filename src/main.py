@@ -8,15 +8,11 @@ import json
 import sys
 import time
 from pathlib import Path
+from typing import Any, Dict, Optional
 
 # Ajouter le répertoire src au path Python
 sys.path.insert(0, str(Path(__file__).parent))
 
-# Import des modules locaux
-from fetch_data import load_with_fallback
-from calibration import calibrate_vasicek_mle, calibrate_vasicek_ols, estimate_model_quality
-from simulation import run_monte_carlo_simulation, export_simulation_results
-
 def parse_arguments():
     """Parse les arguments de ligne de commande"""
     parser = argparse.ArgumentParser(
@@ -29,6 +25,10 @@ def parse_arguments():
                        help="Tenor Euribor (3M par défaut)")
     parser.add_argument("--data-csv", default="data/sample_euribor3m.csv",
                        help="Fichier CSV de fallback")
+    parser.add_argument("--cache-csv", default=None,
+                       help="Cache local des données API (ex: data/cached_euribor3m.csv)")
+    parser.add_argument("--cache-max-age", type=float, default=1.0,
+                       help="Âge maximal du cache (jours)")
     
     # Paramètres de calibration
     parser.add_argument("--calibration", choices=["ols", "mle"], default="mle",
@@ -47,6 +47,10 @@ def parse_arguments():
                        help="Méthode de simulation")
     parser.add_argument("--seed", type=int, default=None,
                        help="Graine aléatoire pour reproductibilité")
+    parser.add_argument("--n-workers", type=int, default=1,
+                       help="Processus de simulation (trajectoires réparties; utile sans numba)")
+    parser.add_argument("--dtype", choices=["float64", "float32"], default="float64",
+                       help="Précision des trajectoires simulées")
     
     # Sortie et export
     parser.add_argument("--export-csv", 
@@ -62,62 +66,125 @@ def parse_arguments():
     
     return parser.parse_args()
 
+def run_pipeline(
+    tenor: str = "3M",
+    data_csv: str = "data/sample_euribor3m.csv",
+    cache_csv: Optional[str] = None,
+    cache_max_age: float = 1.0,
+    calibration: str = "mle",
+    show_quality: bool = False,
+    horizon: int = 252,
+    dt: float = 1/252,
+    n_paths: int = 10000,
+    method: str = "exact",
+    seed: Optional[int] = None,
+    n_workers: int = 1,
+    dtype: str = "float64",
+    export_csv: Optional[str] = None,
+    export_all_paths: bool = False,
+    export_stats: Optional[str] = None,
+    quiet: bool = False,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """
+    Pipeline complet: données -> calibration -> simulation -> exports
+    
+    quiet et verbose ne changent pas le calcul: ils sont seulement
+    reportés dans les métadonnées de l'export JSON.
+    
+    Returns:
+        dict avec data, meta, params, quality, paths, stats
+    """
+    # Import des modules locaux (numpy/pandas/requests) seulement à l'exécution:
+    # `--help` et la validation des arguments restent instantanés
+    from fetch_data import load_with_fallback
+    from calibration import calibrate_vasicek_mle, calibrate_vasicek_ols, estimate_model_quality
+    from simulation import run_monte_carlo_simulation, export_simulation_results
+    
+    start_time = time.time()
+    simulation_args = {
+        "tenor": tenor, "data_csv": data_csv,
+        "cache_csv": cache_csv, "cache_max_age": cache_max_age,
+        "calibration": calibration, "show_quality": show_quality,
+        "horizon": horizon, "dt": dt, "n_paths": n_paths,
+        "method": method, "seed": seed, "n_workers": n_workers,
+        "dtype": dtype,
+        "export_csv": export_csv, "export_all_paths": export_all_paths,
+        "export_stats": export_stats,
+        "quiet": quiet, "verbose": verbose
+    }
+    
+    # 1. Chargement des données
+    data, meta = load_with_fallback(
+        tenor=tenor, path_csv=data_csv,
+        cache_csv=cache_csv, cache_max_age_days=cache_max_age
+    )
+    
+    # 2. Calibration du modèle
+    if calibration == "mle":
+        params = calibrate_vasicek_mle(data["rate"], dt=dt)
+    else:
+        params = calibrate_vasicek_ols(data["rate"], dt=dt)
+    
+    # 3. Qualité de l'ajustement (optionnel)
+    quality = None
+    if show_quality:
+        quality = estimate_model_quality(data["rate"], params, dt=dt)
+    
+    # 4. Simulation Monte Carlo
+    paths, stats = run_monte_carlo_simulation(
+        params=params,
+        horizon=horizon,
+        n_paths=n_paths,
+        dt=dt,
+        method=method,
+        seed=seed,
+        return_stats=True,
+        n_workers=n_workers,
+        dtype=dtype
+    )
+    
+    # 5. Exports
+    if export_csv:
+        export_simulation_results(
+            paths, stats, params, 
+            filename=export_csv,
+            export_all_paths=export_all_paths
+        )
+    
+    if export_stats:
+        with open(export_stats, 'w') as f:
+            export_data = {
+                "parameters": {
+                    "kappa": params.kappa,
+                    "theta": params.theta,
+                    "sigma": params.sigma,
+                    "r0": params.r0
+                },
+                "statistics": stats,
+                "metadata": {
+                    "data_source": meta,
+                    "simulation_args": simulation_args,
+                    "execution_time_seconds": time.time() - start_time
+                }
+            }
+            json.dump(export_data, f, indent=2, default=str)
+    
+    return {
+        "data": data,
+        "meta": meta,
+        "params": params,
+        "quality": quality,
+        "paths": paths,
+        "stats": stats
+    }
+
 def main():
     """Fonction principale"""
     args = parse_arguments()
     
     try:
-        # 1. Chargement des données
-        data, meta = load_with_fallback(tenor=args.tenor, path_csv=args.data_csv)
-        
-        # 2. Calibration du modèle
-        if args.calibration == "mle":
-            params = calibrate_vasicek_mle(data["rate"], dt=args.dt)
-        else:
-            params = calibrate_vasicek_ols(data["rate"], dt=args.dt)
-        
-        # 3. Qualité de l'ajustement (optionnel)
-        if args.show_quality:
-            quality = estimate_model_quality(data["rate"], params, dt=args.dt)
-        
-        # 4. Simulation Monte Carlo
-        paths, stats = run_monte_carlo_simulation(
-            params=params,
-            horizon=args.horizon,
-            n_paths=args.n_paths,
-            dt=args.dt,
-            method=args.method,
-            seed=args.seed,
-            return_stats=True
-        )
-        
-        # 5. Exports
-        if args.export_csv:
-            export_simulation_results(
-                paths, stats, params, 
-                filename=args.export_csv,
-                export_all_paths=args.export_all_paths
-            )
-        
-        if args.export_stats:
-            start_time = time.time()
-            with open(args.export_stats, 'w') as f:
-                export_data = {
-                    "parameters": {
-                        "kappa": params.kappa,
-                        "theta": params.theta,
-                        "sigma": params.sigma,
-                        "r0": params.r0
-                    },
-                    "statistics": stats,
-                    "metadata": {
-                        "data_source": meta,
-                        "simulation_args": vars(args),
-                        "execution_time_seconds": time.time() - start_time
-                    }
-                }
-                json.dump(export_data, f, indent=2, default=str)
-            
+        run_pipeline(**vars(args))
     except Exception as e:
         if args.verbose:
             import traceback
@@ -1,10 +1,18 @@
+import multiprocessing
+import os
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba est optionnel
+    NUMBA_AVAILABLE = False
+
 @dataclass
 class VasicekParams:
     """Paramètres du modèle de Vasicek"""
@@ -13,12 +21,129 @@ class VasicekParams:
     sigma: float
     r0: float
 
+# Taille d'un bloc de tirage: ~2^18 aléas (2 Mo en float64), découpé en lignes de trajectoires
+_DRAW_BLOCK = 1 << 18
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _fill_paths(paths, z, b, c):
+        """paths[j, t] = c + b * paths[j, t-1] + z[j, t-1], une trajectoire (ligne contiguë) par itération"""
+        n_paths, n_cols = paths.shape
+        for j in prange(n_paths):
+            r = paths[j, 0]
+            for t in range(1, n_cols):
+                r = c + b * r + z[j, t-1]
+                paths[j, t] = r
+    
+    @njit(parallel=True, cache=True)
+    def _advance_state(state, z, b, c):
+        """Fait avancer l'état terminal de z.shape[1] pas, sans stocker les trajectoires"""
+        for j in prange(state.shape[0]):
+            r = state[j]
+            for t in range(z.shape[1]):
+                r = c + b * r + z[j, t]
+            state[j] = r
+    
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _max_drawdowns(paths):
+        """Drawdown maximum par trajectoire, un balayage contigu par ligne (sans tableau cumulatif)"""
+        n_paths, n_cols = paths.shape
+        out = np.zeros(n_paths)
+        for j in prange(n_paths):
+            peak = np.float64(paths[j, 0])
+            md = 0.0
+            for t in range(1, n_cols):
+                p = paths[j, t]
+                if p > peak:
+                    peak = p
+                # Drawdown nul là où le pic vaut 0 (évite division par zéro)
+                if peak != 0:
+                    dd = (peak - p) / peak
+                    if dd > md:
+                        md = dd
+            out[j] = md
+        return out
+else:
+    def _fill_paths(paths, z, b, c):
+        """Récurrence sur une copie temps-major du bloc (lignes contiguës), transposée une fois à la fin"""
+        zt = np.ascontiguousarray(z.T)
+        tmp = np.empty(paths.shape[0], dtype=paths.dtype)
+        prev = paths[:, 0]
+        for t in range(zt.shape[0]):
+            # zt[t] devient r_{t+1} en place (aucun temporaire par pas)
+            np.multiply(prev, b, out=tmp)
+            tmp += c
+            zt[t] += tmp
+            prev = zt[t]
+        paths[:, 1:] = zt.T
+    
+    def _advance_state(state, z, b, c):
+        """Fait avancer l'état terminal de z.shape[1] pas, sans stocker les trajectoires"""
+        zt = np.ascontiguousarray(z.T)
+        for t in range(zt.shape[0]):
+            state *= b
+            state += c
+            state += zt[t]
+    
+    def _max_drawdowns(paths):
+        """Drawdown maximum par trajectoire (pic courant via maximum.accumulate)"""
+        peak = np.maximum.accumulate(paths, axis=1)
+        # Drawdown nul là où le pic vaut 0 (évite division par zéro)
+        drawdown = np.divide(peak - paths, peak, out=np.zeros_like(paths), where=peak != 0)
+        return drawdown.max(axis=1)
+
+def _simulate_affine(
+    rng: np.random.Generator,
+    n_steps: int,
+    n_paths: int,
+    r0: float,
+    b: float,
+    c: float,
+    scale: float,
+    terminal_only: bool = False,
+    dtype=np.float64
+) -> np.ndarray:
+    """
+    Récurrence commune aux deux schémas: r_{t+1} = c + b * r_t + scale * Z
+    
+    Les aléas sont tirés par le Generator NumPy par blocs de trajectoires
+    (lignes de n_steps aléas) dans un tampon réutilisé: le flux est celui d'un
+    tirage (n_paths, n_steps) d'un coup, quel que soit le nombre de threads.
+    Les deux modes consomment le même flux, donc terminal_only renvoie
+    exactement paths[:, -1] pour une même graine.
+    """
+    # Constantes dans la précision des trajectoires (même arithmétique numba/NumPy)
+    scalar = np.dtype(dtype).type
+    b, c = scalar(b), scalar(c)
+    
+    if terminal_only:
+        out = np.full(n_paths, r0, dtype=dtype)
+    else:
+        # Une ligne par trajectoire: les réductions par trajectoire sont contiguës
+        out = np.empty((n_paths, n_steps + 1), dtype=dtype)
+        out[:, 0] = r0
+    
+    rows = max(1, min(n_paths, _DRAW_BLOCK // max(n_steps, 1)))
+    z_buf = np.empty((rows, n_steps), dtype=dtype)
+    for lo in range(0, n_paths, rows):
+        hi = min(lo + rows, n_paths)
+        z = z_buf[:hi - lo]
+        rng.standard_normal(out=z, dtype=dtype)
+        z *= scale
+        if terminal_only:
+            _advance_state(out[lo:hi], z, b, c)
+        else:
+            _fill_paths(out[lo:hi], z, b, c)
+    return out
+
 def simulate_vasicek_exact(
     params: VasicekParams, 
     n_steps: int, 
     n_paths: int, 
     dt: float, 
-    seed: int = None
+    seed: int = None,
+    terminal_only: bool = False,
+    dtype=np.float64
 ) -> np.ndarray:
     """
     Simulation exacte du processus de Vasicek (Ornstein-Uhlenbeck)
@@ -28,12 +153,13 @@ def simulate_vasicek_exact(
     Solution exacte:
     r_{t+1} = θ + (r_t - θ)e^{-κΔt} + σ√[(1-e^{-2κΔt})/(2κ)] * Z
     
+    dtype=np.float32 divise par deux la mémoire des trajectoires (précision
+    largement suffisante pour des taux)
+    
     Returns:
-        Array de shape (n_steps + 1, n_paths) avec les trajectoires
+        Array de shape (n_paths, n_steps + 1) avec les trajectoires,
+        ou (n_paths,) avec les seuls taux terminaux si terminal_only
     """
-    if seed is not None:
-        np.random.seed(seed)
-    
     rng = np.random.default_rng(seed)
     kappa, theta, sigma, r0 = params.kappa, params.theta, params.sigma, params.r0
     
@@ -42,55 +168,118 @@ def simulate_vasicek_exact(
     variance = sigma**2 * (1 - np.exp(-2 * kappa * dt)) / (2 * kappa)
     std_dev = np.sqrt(variance)
     
-    # Initialisation des trajectoires
-    paths = np.zeros((n_steps + 1, n_paths))
-    paths[0] = r0
-    
-    # Simulation pas par pas
-    for t in range(1, n_steps + 1):
-        # Tirage aléatoire
-        z = rng.standard_normal(n_paths)
-        
-        # Évolution exacte
-        prev_rates = paths[t-1]
-        mean_rates = theta + (prev_rates - theta) * exp_kappa_dt
-        paths[t] = mean_rates + std_dev * z
-    
-    return paths
+    return _simulate_affine(
+        rng, n_steps, n_paths, r0,
+        b=exp_kappa_dt, c=theta * (1 - exp_kappa_dt), scale=std_dev,
+        terminal_only=terminal_only, dtype=dtype
+    )
 
 def simulate_vasicek_euler(
     params: VasicekParams,
     n_steps: int, 
     n_paths: int,
     dt: float,
-    seed: int = None
+    seed: int = None,
+    terminal_only: bool = False,
+    dtype=np.float64
 ) -> np.ndarray:
     """
     Simulation par schéma d'Euler (approximation discrète)
     
     r_{t+1} = r_t + κ(θ - r_t)Δt + σ√Δt * Z
     """
-    if seed is not None:
-        np.random.seed(seed)
-        
     rng = np.random.default_rng(seed)
     kappa, theta, sigma, r0 = params.kappa, params.theta, params.sigma, params.r0
     
-    paths = np.zeros((n_steps + 1, n_paths))
-    paths[0] = r0
-    
-    sqrt_dt = np.sqrt(dt)
-    
-    for t in range(1, n_steps + 1):
-        z = rng.standard_normal(n_paths)
-        prev_rates = paths[t-1]
+    return _simulate_affine(
+        rng, n_steps, n_paths, r0,
+        b=1 - kappa * dt, c=kappa * theta * dt, scale=sigma * np.sqrt(dt),
+        terminal_only=terminal_only, dtype=dtype
+    )
+
+_cuda_terminal_kernel = None
+
+def _get_cuda_terminal_kernel():
+    """Construit le noyau CUDA au premier appel et le garde en cache"""
+    # Noms rendus globaux au module: le noyau les résout comme globales
+    # (le simulateur NUMBA_ENABLE_CUDASIM ne substitue que celles-ci)
+    global _cuda_terminal_kernel, cuda, xoroshiro128p_normal_float64
+    if _cuda_terminal_kernel is None:
+        from numba import cuda
+        from numba.cuda.random import xoroshiro128p_normal_float64
         
-        drift = kappa * (theta - prev_rates) * dt
-        diffusion = sigma * sqrt_dt * z
+        @cuda.jit
+        def _vasicek_terminal_kernel(states, out, r0, b, c, std_dev, n_steps):
+            """Un thread par trajectoire (grid-stride); seul le taux terminal est écrit"""
+            tid = cuda.grid(1)
+            stride = cuda.gridsize(1)
+            for i in range(tid, out.shape[0], stride):
+                r = r0
+                for _ in range(n_steps):
+                    r = c + b * r + std_dev * xoroshiro128p_normal_float64(states, tid)
+                out[i] = r
         
-        paths[t] = prev_rates + drift + diffusion
+        _cuda_terminal_kernel = _vasicek_terminal_kernel
+    return _cuda_terminal_kernel
+
+def simulate_vasicek_cuda(
+    params: VasicekParams,
+    n_steps: int,
+    n_paths: int,
+    dt: float,
+    seed: int = None,
+    threads_per_block: int = 256
+) -> np.ndarray:
+    """
+    Simulation exacte sur GPU (numba.cuda), pour n_paths de l'ordre de 10^5+
+    
+    Chaque thread simule une trajectoire complète avec son propre générateur
+    xoroshiro128+; seuls les taux terminaux transitent par le bus PCIe.
+    Le flux aléatoire diffère de celui des simulateurs CPU.
+    numba.cuda n'est importé qu'ici: l'import du module simulation reste léger.
+    
+    Returns:
+        Array de shape (n_paths,) avec les taux terminaux
+    """
+    try:
+        from numba import cuda
+        from numba.cuda.random import create_xoroshiro128p_states
+    except ImportError:  # support CUDA de numba optionnel
+        cuda = None
+    if cuda is None or not cuda.is_available():
+        raise RuntimeError("Simulation CUDA indisponible (numba.cuda ou GPU absent)")
+    
+    kappa, theta, sigma, r0 = params.kappa, params.theta, params.sigma, params.r0
+    exp_kappa_dt = np.exp(-kappa * dt)
+    std_dev = np.sqrt(sigma**2 * (1 - np.exp(-2 * kappa * dt)) / (2 * kappa))
+    
+    if seed is None:
+        seed = int(np.random.default_rng().integers(2**63))
     
-    return paths
+    blocks = (n_paths + threads_per_block - 1) // threads_per_block
+    states = create_xoroshiro128p_states(blocks * threads_per_block, seed=seed)
+    d_out = cuda.device_array(n_paths, dtype=np.float64)
+    
+    _get_cuda_terminal_kernel()[blocks, threads_per_block](
+        states, d_out, r0, exp_kappa_dt, theta * (1 - exp_kappa_dt), std_dev, n_steps
+    )
+    return d_out.copy_to_host()
+
+_SIMULATORS = {
+    "exact": simulate_vasicek_exact,
+    "euler": simulate_vasicek_euler,
+}
+
+def _init_worker():
+    """Un thread numba par worker: les processus se partagent déjà les cœurs"""
+    if NUMBA_AVAILABLE:
+        import numba
+        numba.set_num_threads(1)
+
+def _simulate_chunk(args) -> np.ndarray:
+    """Tâche d'un worker: simule un sous-ensemble indépendant de trajectoires"""
+    method, params, n_steps, n_paths, dt, seed, dtype = args
+    return _SIMULATORS[method](params, n_steps, n_paths, dt, seed, dtype=dtype)
 
 def run_monte_carlo_simulation(
     params: VasicekParams,
@@ -99,7 +288,9 @@ def run_monte_carlo_simulation(
     dt: float = 1/252,
     method: str = "exact",
     seed: int = None,
-    return_stats: bool = True
+    return_stats: bool = True,
+    n_workers: Optional[int] = 1,
+    dtype=np.float64
 ) -> Tuple[np.ndarray, Dict[str, Any]]:
     """
     Lance une simulation Monte Carlo complète
@@ -112,24 +303,56 @@ def run_monte_carlo_simulation(
         method: "exact" ou "euler"
         seed: Graine aléatoire
         return_stats: Calculer les statistiques
+        n_workers: Nombre de processus (None = min(cpu_count, 8)); graines
+            dérivées par SeedSequence.spawn, reproductible à (seed, n_workers) fixés.
+            Utile seulement sans numba: les noyaux numba utilisent déjà tous
+            les cœurs (prange), chaque worker est alors limité à un thread
+        dtype: Précision des trajectoires (np.float64 ou np.float32)
         
     Returns:
         (paths, statistics)
     """
     # Sélection de la méthode
-    if method.lower() == "exact":
-        paths = simulate_vasicek_exact(params, horizon, n_paths, dt, seed)
-    elif method.lower() == "euler":
-        paths = simulate_vasicek_euler(params, horizon, n_paths, dt, seed)
-    else:
+    method = method.lower()
+    if method not in _SIMULATORS:
         raise ValueError(f"Méthode inconnue: {method}. Utilisez 'exact' ou 'euler'")
     
+    if n_workers is None:
+        n_workers = min(os.cpu_count() or 1, 8)
+    n_workers = max(1, min(n_workers, n_paths))
+    
+    if n_workers == 1:
+        paths = _SIMULATORS[method](params, horizon, n_paths, dt, seed, dtype=dtype)
+    else:
+        child_seeds = np.random.SeedSequence(seed).spawn(n_workers)
+        # Découpage identique à np.array_split: les premiers chunks ont une trajectoire de plus
+        base, extra = divmod(n_paths, n_workers)
+        chunk_sizes = [base + (i < extra) for i in range(n_workers)]
+        tasks = [(method, params, horizon, size, dt, child_seed, dtype)
+                 for size, child_seed in zip(chunk_sizes, child_seeds)]
+        # "spawn": un fork après démarrage des threads numba peut se bloquer
+        with multiprocessing.get_context("spawn").Pool(n_workers, initializer=_init_worker) as pool:
+            paths = np.concatenate(list(pool.imap(_simulate_chunk, tasks)), axis=0)
+    
     stats = {}
     if return_stats:
         stats = calculate_simulation_statistics(paths, params, dt)
     
     return paths, stats
 
+_TERMINAL_QUANTILES = np.array([0.05, 0.25, 0.5, 0.75, 0.95])
+
+def _sorted_quantiles(sorted_values: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    Quantiles d'un tableau déjà trié, par indexation directe
+    
+    Même interpolation linéaire que np.quantile (méthode par défaut).
+    """
+    h = (sorted_values.size - 1) * q
+    lo = np.floor(h).astype(np.intp)
+    hi = np.minimum(lo + 1, sorted_values.size - 1)
+    return sorted_values[lo] + (h - lo) * (sorted_values[hi] - sorted_values[lo])
+
 def calculate_simulation_statistics(
     paths: np.ndarray, 
     params: VasicekParams, 
@@ -138,32 +361,34 @@ def calculate_simulation_statistics(
     """
     Calcule les statistiques de la simulation
     """
-    terminal_rates = paths[-1]  # Taux finaux
-    initial_rates = paths[0]    # Taux initiaux
+    terminal_rates = paths[:, -1]  # Taux finaux
+    initial_rates = paths[:, 0]    # Taux initiaux
     
-    # Statistiques terminales
+    # Statistiques terminales: un seul tri, statistiques d'ordre par indexation
+    sorted_rates = np.sort(terminal_rates)
+    p05, p25, median, p75, p95 = _sorted_quantiles(sorted_rates, _TERMINAL_QUANTILES)
     terminal_stats = {
-        "mean": float(np.mean(terminal_rates)),
-        "std": float(np.std(terminal_rates, ddof=1)),
-        "min": float(np.min(terminal_rates)),
-        "max": float(np.max(terminal_rates)),
-        "median": float(np.median(terminal_rates)),
-        "p05": float(np.percentile(terminal_rates, 5)),
-        "p25": float(np.percentile(terminal_rates, 25)),
-        "p75": float(np.percentile(terminal_rates, 75)),
-        "p95": float(np.percentile(terminal_rates, 95)),
+        "mean": float(terminal_rates.mean()),
+        "std": float(terminal_rates.std(ddof=1)),
+        "min": float(sorted_rates[0]),
+        "max": float(sorted_rates[-1]),
+        "median": float(median),
+        "p05": float(p05),
+        "p25": float(p25),
+        "p75": float(p75),
+        "p95": float(p95),
     }
     
     # Statistiques de trajet
     path_stats = {
-        "mean_path_volatility": float(np.mean([np.std(paths[:, i], ddof=1) for i in range(paths.shape[1])])),
+        "mean_path_volatility": float(np.std(paths, axis=1, ddof=1).mean()),
         "max_drawdown": calculate_max_drawdown(paths),
         "time_above_initial": float(np.mean(terminal_rates > initial_rates)),
-        "negative_rates_prob": float(np.mean(np.any(paths < 0, axis=0))),
+        "negative_rates_prob": float(np.mean(np.any(paths < 0, axis=1))),
     }
     
     # Théorie vs simulation (vérification)
-    T = len(paths) * dt
+    T = paths.shape[1] * dt
     theoretical_mean = params.theta + (params.r0 - params.theta) * np.exp(-params.kappa * T)
     theoretical_var = (params.sigma**2 / (2 * params.kappa)) * (1 - np.exp(-2 * params.kappa * T))
     
@@ -179,8 +404,8 @@ def calculate_simulation_statistics(
         "paths": path_stats,
         "validation": validation,
         "simulation_info": {
-            "n_paths": paths.shape[1],
-            "n_steps": paths.shape[0] - 1,
+            "n_paths": paths.shape[0],
+            "n_steps": paths.shape[1] - 1,
             "total_time_years": T,
             "dt": dt
         }
@@ -188,31 +413,26 @@ def calculate_simulation_statistics(
 
 def calculate_max_drawdown(paths: np.ndarray) -> float:
     """Calcule le drawdown maximum moyen sur toutes les trajectoires"""
-    drawdowns = []
-    for i in range(paths.shape[1]):
-        path = paths[:, i]
-        peak = np.maximum.accumulate(path)
-        drawdown = (peak - path) / peak
-        max_dd = np.max(drawdown)
-        drawdowns.append(max_dd)
-    return float(np.mean(drawdowns))
+    return float(_max_drawdowns(paths).mean())
 
 def paths_to_dataframe(paths: np.ndarray, dt: float = 1/252) -> pd.DataFrame:
     """
     Convertit les trajectoires en DataFrame avec index temporel
+    
+    Une ligne par pas de temps; les colonnes sont les indices entiers des
+    trajectoires (RangeIndex).
     """
-    n_steps, n_paths = paths.shape
-    time_index = np.arange(n_steps) * dt
+    time_index = np.arange(paths.shape[1]) * dt
     
-    df = pd.DataFrame(
-        paths, 
-        index=time_index,
-        columns=[f"path_{i}" for i in range(n_paths)]
-    )
+    df = pd.DataFrame(paths.T, index=time_index)
     df.index.name = "time_years"
     
     return df
 
+def _paths_csv_header(n_paths: int) -> list:
+    """Noms de colonnes des trajectoires dans les exports CSV"""
+    return [f"path_{i}" for i in range(n_paths)]
+
 def export_simulation_results(
     paths: np.ndarray, 
     stats: Dict[str, Any], 
@@ -223,15 +443,19 @@ def export_simulation_results(
     """
     Exporte les résultats de simulation
     """
+    dt = stats.get("simulation_info", {}).get("dt", 1/252)
+    
     if export_all_paths:
-        # Export toutes les trajectoires
-        df = paths_to_dataframe(paths)
-        df.to_csv(filename)
+        # Export toutes les trajectoires, sans passer par pandas
+        time_index = np.arange(paths.shape[1]) * dt
+        header = ",".join(["time_years"] + _paths_csv_header(paths.shape[0]))
+        np.savetxt(filename, np.column_stack([time_index, paths.T]),
+                   delimiter=",", fmt="%.6g", header=header, comments="")
     else:
         # Export statistiques + quelques trajectoires échantillon
-        sample_size = min(100, paths.shape[1])
-        sample_paths = paths[:, :sample_size]
-        df = paths_to_dataframe(sample_paths)
+        sample_size = min(100, paths.shape[0])
+        sample_paths = paths[:sample_size]
+        df = paths_to_dataframe(sample_paths, dt)
         
         # Ajout des statistiques comme métadonnées
         with open(filename, 'w') as f:
@@ -240,7 +464,8 @@ def export_simulation_results(
             f.write(f"# Statistiques: {stats['terminal']}\n")
             f.write("#\n")
             
-        df.to_csv(filename, mode='a')
+        df.to_csv(filename, mode='a', header=_paths_csv_header(sample_size),
+                  float_format="%.6g")
 
 if __name__ == "__main__":
     # Test du module
@@ -1,4 +1,5 @@
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
 import numpy as np
 import pandas as pd
 from typing import Optional, Tuple
@@ -8,33 +9,90 @@ import seaborn as sns
 plt.style.use('seaborn-v0_8' if 'seaborn-v0_8' in plt.style.available else 'default')
 sns.set_palette("husl")
 
+PATH_QUANTILES = [0.05, 0.25, 0.5, 0.75, 0.95]
+
+def as_plot_paths(paths: np.ndarray) -> np.ndarray:
+    """
+    Trajectoires en float32 pour les graphiques (sans copie si déjà float32)
+    
+    La précision float32 suffit à l'affichage. Des trajectoires float64
+    (dtype par défaut) sont converties, ce qui divise par deux la mémoire des
+    agrégats; des trajectoires déjà float32 sont renvoyées telles quelles.
+    """
+    return paths.astype(np.float32, copy=False)
+
+def compute_path_summary(paths: np.ndarray) -> dict:
+    """
+    Calcule une fois les agrégats de trajectoires partagés entre graphiques
+    
+    Les cinq percentiles par pas de temps (P5, P25, P50, P75, P95) sont
+    obtenus en un seul appel np.quantile; les bandes P5/P95 en sont extraites.
+    """
+    percentile_paths = np.quantile(paths, PATH_QUANTILES, axis=0)
+    terminal_rates = paths[:, -1]
+    hist_counts, hist_edges = np.histogram(terminal_rates, bins=50, density=True)
+    return {
+        "mean_path": paths.mean(axis=0),
+        "percentile_paths": percentile_paths,
+        "p05_path": percentile_paths[0],
+        "p95_path": percentile_paths[-1],
+        "terminal_rates": terminal_rates,
+        "terminal_hist": (hist_counts, hist_edges),
+    }
+
+def add_sample_paths(ax, time_axis: np.ndarray, paths: np.ndarray,
+                     alpha: float, linewidth: float, rasterized: bool = False):
+    """
+    Trace des trajectoires (une par ligne de paths) en un seul LineCollection
+    
+    Couleurs prises dans le cycle matplotlib courant, comme ax.plot.
+    """
+    segs = np.stack([np.broadcast_to(time_axis, (paths.shape[0], len(time_axis))),
+                     paths], axis=-1)
+    cycle_colors = plt.rcParams['axes.prop_cycle'].by_key()['color']
+    ax.add_collection(LineCollection(segs, colors=cycle_colors, alpha=alpha,
+                                     linewidths=linewidth, rasterized=rasterized))
+    ax.autoscale_view()
+
 def plot_simulation_results(
     paths: np.ndarray,
     stats: dict,
     params,
     n_sample_paths: int = 50,
     figsize: Tuple[int, int] = (14, 10),
-    save_path: Optional[str] = None
+    save_path: Optional[str] = None,
+    path_summary: Optional[dict] = None,
+    seed: Optional[int] = None
 ):
     """
     Crée un graphique complet des résultats de simulation
+    
+    path_summary: agrégats issus de compute_path_summary (recalculés si absent)
+    seed: graine du tirage des trajectoires échantillon affichées
     """
+    if path_summary is None:
+        path_summary = compute_path_summary(paths)
+    
+    term = stats['terminal']
+    sim = stats['simulation_info']
+    val = stats.get('validation')
+    
     fig, axes = plt.subplots(2, 2, figsize=figsize)
     fig.suptitle("Simulation Monte Carlo Euribor - Modèle de Vasicek", fontsize=16, fontweight='bold')
     
-    time_axis = np.arange(paths.shape[0]) * stats['simulation_info']['dt']
+    time_axis = np.arange(paths.shape[1]) * sim['dt']
     
     # 1. Trajectoires échantillon
     ax1 = axes[0, 0]
-    sample_indices = np.random.choice(paths.shape[1], min(n_sample_paths, paths.shape[1]), replace=False)
+    rng = np.random.default_rng(seed)
+    sample_indices = rng.choice(paths.shape[0], min(n_sample_paths, paths.shape[0]), replace=False)
     
-    for i in sample_indices:
-        ax1.plot(time_axis, paths[:, i], alpha=0.6, linewidth=0.8)
+    add_sample_paths(ax1, time_axis, paths[sample_indices], alpha=0.6, linewidth=0.8)
     
     # Moyenne et percentiles
-    mean_path = np.mean(paths, axis=1)
-    p05_path = np.percentile(paths, 5, axis=1)
-    p95_path = np.percentile(paths, 95, axis=1)
+    mean_path = path_summary['mean_path']
+    p05_path = path_summary['p05_path']
+    p95_path = path_summary['p95_path']
     
     ax1.plot(time_axis, mean_path, 'red', linewidth=2, label='Moyenne')
     ax1.fill_between(time_axis, p05_path, p95_path, alpha=0.3, color='red', label='IC 90%')
@@ -47,23 +105,24 @@ def plot_simulation_results(
     
     # 2. Distribution terminale
     ax2 = axes[0, 1]
-    terminal_rates = paths[-1]
-    
-    ax2.hist(terminal_rates, bins=50, density=True, alpha=0.7, color='skyblue', edgecolor='black')
+    hist_counts, hist_edges = path_summary['terminal_hist']
+    ax2.bar(hist_edges[:-1], hist_counts, width=np.diff(hist_edges), align='edge',
+            alpha=0.7, color='skyblue', edgecolor='black')
     
     # Statistiques
-    mean_term = stats['terminal']['mean']
-    std_term = stats['terminal']['std']
+    mean_term = term['mean']
+    p05_term = term['p05']
+    p95_term = term['p95']
     
     ax2.axvline(mean_term, color='red', linestyle='--', linewidth=2, label=f'Moyenne: {mean_term:.4f}')
-    ax2.axvline(stats['terminal']['p05'], color='orange', linestyle=':', label=f"P5: {stats['terminal']['p05']:.4f}")
-    ax2.axvline(stats['terminal']['p95'], color='orange', linestyle=':', label=f"P95: {stats['terminal']['p95']:.4f}")
+    ax2.axvline(p05_term, color='orange', linestyle=':', label=f"P5: {p05_term:.4f}")
+    ax2.axvline(p95_term, color='orange', linestyle=':', label=f"P95: {p95_term:.4f}")
     
     # Distribution théorique (si disponible)
-    if 'validation' in stats:
-        theo_mean = stats['validation']['theoretical_terminal_mean']
-        theo_std = stats['validation']['theoretical_terminal_std']
-        x_theo = np.linspace(terminal_rates.min(), terminal_rates.max(), 100)
+    if val is not None:
+        theo_mean = val['theoretical_terminal_mean']
+        theo_std = val['theoretical_terminal_std']
+        x_theo = np.linspace(term['min'], term['max'], 100)
         y_theo = (1/np.sqrt(2*np.pi*theo_std**2)) * np.exp(-0.5*((x_theo-theo_mean)/theo_std)**2)
         ax2.plot(x_theo, y_theo, 'green', linewidth=2, label='Théorique')
     
@@ -78,8 +137,7 @@ def plot_simulation_results(
     percentiles = [5, 25, 50, 75, 95]
     colors = ['red', 'orange', 'blue', 'orange', 'red']
     
-    for p, color in zip(percentiles, colors):
-        p_path = np.percentile(paths, p, axis=1)
+    for p_path, p, color in zip(path_summary['percentile_paths'], percentiles, colors):
         ax3.plot(time_axis, p_path, color=color, linewidth=1.5, label=f'P{p}')
     
     ax3.set_title('Évolution des percentiles')
@@ -101,22 +159,22 @@ PARAMÈTRES VASICEK:
 r₀ (taux initial): {params.r0:.4f}
 
 STATISTIQUES TERMINALES:
-Moyenne: {stats['terminal']['mean']:.4f}
-Médiane: {stats['terminal']['median']:.4f}
-Écart-type: {stats['terminal']['std']:.4f}
-Min/Max: {stats['terminal']['min']:.4f} / {stats['terminal']['max']:.4f}
+Moyenne: {mean_term:.4f}
+Médiane: {term['median']:.4f}
+Écart-type: {term['std']:.4f}
+Min/Max: {term['min']:.4f} / {term['max']:.4f}
 
 SIMULATION:
-Trajectoires: {stats['simulation_info']['n_paths']:,}
-Horizon: {stats['simulation_info']['n_steps']} pas
-Durée: {stats['simulation_info']['total_time_years']:.2f} ans
+Trajectoires: {sim['n_paths']:,}
+Horizon: {sim['n_steps']} pas
+Durée: {sim['total_time_years']:.2f} ans
 """
     
-    if 'validation' in stats:
+    if val is not None:
         stats_text += f"""
 VALIDATION:
-Erreur moyenne: {stats['validation']['mean_error']:.5f}
-Erreur volatilité: {stats['validation']['std_error']:.5f}
+Erreur moyenne: {val['mean_error']:.5f}
+Erreur volatilité: {val['std_error']:.5f}
 """
     
     ax4.text(0.05, 0.95, stats_text, transform=ax4.transAxes, fontsize=10,
@@ -138,9 +196,16 @@ def plot_data_overview(data: pd.DataFrame, save_path: Optional[str] = None):
     fig, axes = plt.subplots(2, 2, figsize=(12, 8))
     fig.suptitle("Données historiques Euribor", fontsize=14, fontweight='bold')
     
+    # Colonnes extraites une fois en tableaux NumPy (triées par date)
+    data_sorted = data if data['date'].is_monotonic_increasing else data.sort_values('date')
+    dates = data_sorted['date'].to_numpy()
+    rate = data_sorted['rate'].to_numpy()
+    rate_mean = rate.mean()
+    rate_diff = np.diff(rate)
+    
     # 1. Série temporelle
     ax1 = axes[0, 0]
-    ax1.plot(data['date'], data['rate'], linewidth=1, color='navy')
+    ax1.plot(dates, rate, linewidth=1, color='navy')
     ax1.set_title('Évolution temporelle')
     ax1.set_xlabel('Date')
     ax1.set_ylabel('Taux')
@@ -148,8 +213,8 @@ def plot_data_overview(data: pd.DataFrame, save_path: Optional[str] = None):
     
     # 2. Distribution
     ax2 = axes[0, 1]
-    ax2.hist(data['rate'], bins=30, density=True, alpha=0.7, color='lightblue', edgecolor='black')
-    ax2.axvline(data['rate'].mean(), color='red', linestyle='--', label=f'Moyenne: {data["rate"].mean():.4f}')
+    ax2.hist(rate, bins=30, density=True, alpha=0.7, color='lightblue', edgecolor='black')
+    ax2.axvline(rate_mean, color='red', linestyle='--', label=f'Moyenne: {rate_mean:.4f}')
     ax2.set_title('Distribution des taux')
     ax2.set_xlabel('Taux')
     ax2.set_ylabel('Densité')
@@ -158,9 +223,7 @@ def plot_data_overview(data: pd.DataFrame, save_path: Optional[str] = None):
     
     # 3. Variations quotidiennes
     ax3 = axes[1, 0]
-    data_sorted = data.sort_values('date')
-    rate_diff = data_sorted['rate'].diff().dropna()
-    ax3.plot(data_sorted['date'].iloc[1:], rate_diff, linewidth=0.8, alpha=0.8, color='darkgreen')
+    ax3.plot(dates[1:], rate_diff, linewidth=0.8, alpha=0.8, color='darkgreen')
     ax3.axhline(0, color='red', linestyle='-', alpha=0.5)
     ax3.set_title('Variations quotidiennes')
     ax3.set_xlabel('Date')
@@ -174,19 +237,19 @@ def plot_data_overview(data: pd.DataFrame, save_path: Optional[str] = None):
     stats_text = f"""
 STATISTIQUES DESCRIPTIVES:
 
-Observations: {len(data)}
-Période: {data['date'].min().date()} 
-         → {data['date'].max().date()}
+Observations: {len(rate)}
+Période: {pd.Timestamp(dates[0]).date()} 
+         → {pd.Timestamp(dates[-1]).date()}
 
 Taux:
-  Moyenne: {data['rate'].mean():.4f}
-  Médiane: {data['rate'].median():.4f}
-  Écart-type: {data['rate'].std():.4f}
-  Min/Max: {data['rate'].min():.4f} / {data['rate'].max():.4f}
+  Moyenne: {rate_mean:.4f}
+  Médiane: {np.median(rate):.4f}
+  Écart-type: {rate.std(ddof=1):.4f}
+  Min/Max: {rate.min():.4f} / {rate.max():.4f}
 
 Variations:
   Moyenne: {rate_diff.mean():.6f}
-  Écart-type: {rate_diff.std():.6f}
+  Écart-type: {rate_diff.std(ddof=1):.6f}
   Min/Max: {rate_diff.min():.6f} / {rate_diff.max():.6f}
 """
     
@@ -216,7 +279,7 @@ if __name__ == "__main__":
         # Simulation et visualisation
         params = calibrate_vasicek_mle(data["rate"])
         paths, stats = run_monte_carlo_simulation(params, horizon=252, n_paths=2000, seed=42)
-        plot_simulation_results(paths, stats, params)
+        plot_simulation_results(paths, stats, params, seed=42)
         
     except Exception as e:
         print(f"Erreur: {e}")
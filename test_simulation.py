@@ -0,0 +1,91 @@
+"""Tests de la récurrence Monte Carlo (backends numba et NumPy) et des quantiles triés"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SRC = Path(__file__).parent / "src"
+sys.path.insert(0, str(SRC))
+
+import simulation
+from simulation import VasicekParams, simulate_vasicek_exact, simulate_vasicek_euler
+
+PARAMS = VasicekParams(kappa=2.0, theta=0.03, sigma=0.01, r0=0.035)
+DT = 1/252
+SEED = 7
+
+def reference_paths(method, n_steps, n_paths, dtype):
+    """Récurrence écrite à la main sur un seul tirage (n_paths, n_steps)"""
+    kappa, theta, sigma, r0 = PARAMS.kappa, PARAMS.theta, PARAMS.sigma, PARAMS.r0
+    if method == "exact":
+        b = np.exp(-kappa * DT)
+        c, scale = theta * (1 - b), np.sqrt(sigma**2 * (1 - np.exp(-2 * kappa * DT)) / (2 * kappa))
+    else:
+        b, c, scale = 1 - kappa * DT, kappa * theta * DT, sigma * np.sqrt(DT)
+    b, c = np.dtype(dtype).type(b), np.dtype(dtype).type(c)
+
+    z = np.random.default_rng(SEED).standard_normal((n_paths, n_steps), dtype=dtype)
+    z *= scale
+    paths = np.empty((n_paths, n_steps + 1), dtype=dtype)
+    paths[:, 0] = r0
+    for t in range(n_steps):
+        paths[:, t + 1] = c + b * paths[:, t] + z[:, t]
+    return paths
+
+SIMULATORS = {"exact": simulate_vasicek_exact, "euler": simulate_vasicek_euler}
+
+# Petit bloc de tirage: plusieurs blocs de trajectoires, dont un dernier incomplet
+@pytest.mark.parametrize("draw_block", [1 << 18, 64])
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("method", ["exact", "euler"])
+def test_paths_match_reference_recursion(monkeypatch, method, dtype, draw_block):
+    monkeypatch.setattr(simulation, "_DRAW_BLOCK", draw_block)
+    paths = SIMULATORS[method](PARAMS, 30, 37, DT, SEED, dtype=dtype)
+    assert paths.dtype == dtype
+    np.testing.assert_array_equal(paths, reference_paths(method, 30, 37, dtype))
+
+def test_numpy_fallback_matches_reference(tmp_path):
+    # numba masqué dans un processus séparé: force la branche NumPy
+    out = tmp_path / "paths.npz"
+    script = f"""
+import sys
+sys.modules["numba"] = None
+sys.path.insert(0, {str(SRC)!r})
+import numpy as np
+import simulation
+assert not simulation.NUMBA_AVAILABLE
+simulation._DRAW_BLOCK = 64
+p = simulation.VasicekParams(kappa={PARAMS.kappa}, theta={PARAMS.theta}, sigma={PARAMS.sigma}, r0={PARAMS.r0})
+np.savez({str(out)!r}, **{{
+    f"{{m}}_{{d}}": getattr(simulation, f"simulate_vasicek_{{m}}")(p, 30, 37, {DT!r}, {SEED}, dtype=d)
+    for m in ("exact", "euler") for d in ("float64", "float32")
+}})
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
+    with np.load(out) as results:
+        for method in ("exact", "euler"):
+            for dtype in (np.float64, np.float32):
+                np.testing.assert_array_equal(
+                    results[f"{method}_{np.dtype(dtype).name}"],
+                    reference_paths(method, 30, 37, dtype)
+                )
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("method", ["exact", "euler"])
+def test_terminal_only_matches_last_column(monkeypatch, method, dtype):
+    monkeypatch.setattr(simulation, "_DRAW_BLOCK", 64)
+    paths = SIMULATORS[method](PARAMS, 30, 37, DT, SEED, dtype=dtype)
+    terminal = SIMULATORS[method](PARAMS, 30, 37, DT, SEED, terminal_only=True, dtype=dtype)
+    np.testing.assert_array_equal(terminal, paths[:, -1])
+
+@pytest.mark.parametrize("size", [1, 2, 5, 20, 1001])
+def test_sorted_quantiles_matches_np_quantile(size):
+    values = np.random.default_rng(size).standard_normal(size)
+    q = simulation._TERMINAL_QUANTILES
+    np.testing.assert_allclose(
+        simulation._sorted_quantiles(np.sort(values), q), np.quantile(values, q),
+        rtol=1e-12, atol=1e-15
+    )
@@ -0,0 +1,37 @@
+"""Tests des cas limites du pricing Black-Scholes (bs_call)"""
+
+from math import exp
+
+import numpy as np
+import pytest
+
+from trading_strategy_evaluation import bs_call, OptionPricer
+
+R = 0.05
+
+def test_zero_volatility_gives_deterministic_limit():
+    # Call ITM forward: S - K*e^{-rT}; call OTM: 0
+    assert bs_call(100.0, 95.0, 1.0, R, 0.0) == pytest.approx(100.0 - 95.0*exp(-R))
+    assert bs_call(90.0, 95.0, 1.0, R, 0.0) == 0
+
+def test_zero_maturity_gives_intrinsic_value():
+    assert bs_call(100.0, 95.0, 0.0, R, 0.2) == 5.0
+    assert bs_call(90.0, 95.0, 0.0, R, 0.2) == 0
+
+def test_non_positive_spot_or_strike_raises():
+    with pytest.raises(ValueError):
+        bs_call(0.0, 95.0, 1.0, R, 0.2)
+    with pytest.raises(ValueError):
+        bs_call(100.0, -1.0, 1.0, R, 0.2)
+
+def test_array_branch_matches_scalar_branch_on_edge_cases():
+    S = np.array([100.0, 90.0, 100.0, 97.0])
+    K = np.array([95.0, 95.0, 95.0, 97.12])
+    T = np.array([1.0, 1.0, 0.0, 30/365])
+    for sigma in (0.0, 0.15):
+        expected = [bs_call(s, k, t, R, sigma) for s, k, t in zip(S, K, T)]
+        np.testing.assert_allclose(bs_call(S, K, T, R, sigma), expected)
+
+def test_put_call_parity_with_zero_volatility():
+    put = OptionPricer.black_scholes_put(90.0, 95.0, 1.0, R, 0.0)
+    assert put == pytest.approx(95.0*exp(-R) - 90.0)
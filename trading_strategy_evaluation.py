@@ -10,7 +10,9 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
 from typing import List, Dict, Tuple
-import math
+from functools import lru_cache
+from math import erf, exp, log, sqrt
+from scipy.special import ndtr
 
 @dataclass
 class OptionLeg:
@@ -34,28 +36,55 @@ class StrategyMetrics:
     breakeven_points: List[float]
     breakeven_probability: float
     
-class OptionPricer:
-    """Pricing d'options simplifié (Black-Scholes)"""
+def bs_call(S, K, T, r, sigma):
+    """
+    Prix d'un call Black-Scholes
     
-    @staticmethod
-    def black_scholes_call(S, K, T, r, sigma):
-        """Prix d'un call Black-Scholes"""
+    Entrées scalaires: math.erf (pas de dispatch NumPy/SciPy).
+    Entrées tableaux: scipy.special.ndtr, vectorisé sur S, K, T.
+    
+    Volatilité nulle (sigma * sqrt(T) == 0): limite déterministe max(S - K*e^{-rT}, 0).
+    """
+    if np.ndim(S) == 0 and np.ndim(K) == 0 and np.ndim(T) == 0:
         if T <= 0:
             return max(S - K, 0)
         
-        d1 = (np.log(S/K) + (r + 0.5*sigma**2)*T) / (sigma*np.sqrt(T))
-        d2 = d1 - sigma*np.sqrt(T)
+        discount = exp(-r*T)
+        vol_sqrt_T = sigma*sqrt(T)
+        if vol_sqrt_T == 0:
+            return max(S - K*discount, 0)
+        if S <= 0 or K <= 0:
+            raise ValueError(f"S et K doivent être strictement positifs (S={S}, K={K})")
         
-        from scipy.stats import norm
-        call_price = S*norm.cdf(d1) - K*np.exp(-r*T)*norm.cdf(d2)
+        d1 = (log(S/K) + (r + 0.5*sigma*sigma)*T) / vol_sqrt_T
+        d2 = d1 - vol_sqrt_T
+        call_price = S*0.5*(1 + erf(d1/sqrt(2))) - K*discount*0.5*(1 + erf(d2/sqrt(2)))
         return max(call_price, 0)
     
+    S, K, T = np.broadcast_arrays(np.asarray(S, dtype=float), np.asarray(K, dtype=float),
+                                  np.asarray(T, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discount = np.exp(-r*T)
+        vol_sqrt_T = sigma*np.sqrt(T)
+        d1 = (np.log(S/K) + (r + 0.5*sigma*sigma)*T) / vol_sqrt_T
+        call_price = S*ndtr(d1) - K*discount*ndtr(d1 - vol_sqrt_T)
+    call_price = np.where(vol_sqrt_T == 0, S - K*discount, call_price)
+    return np.where(T > 0, np.maximum(call_price, 0), np.maximum(S - K, 0))
+
+class OptionPricer:
+    """Pricing d'options simplifié (Black-Scholes)"""
+    
+    @staticmethod
+    def black_scholes_call(S, K, T, r, sigma):
+        """Prix d'un call Black-Scholes"""
+        return bs_call(S, K, T, r, sigma)
+    
     @staticmethod
     def black_scholes_put(S, K, T, r, sigma):
-        """Prix d'un put Black-Scholes"""
-        call_price = OptionPricer.black_scholes_call(S, K, T, r, sigma)
+        """Prix d'un put Black-Scholes (parité call-put)"""
+        call_price = bs_call(S, K, T, r, sigma)
         put_price = call_price - S + K*np.exp(-r*T)
-        return max(put_price, 0)
+        return np.maximum(put_price, 0) if np.ndim(put_price) else max(put_price, 0)
 
 class StrategyEvaluator:
     """Évaluateur de stratégies d'options"""
@@ -67,15 +96,22 @@ class StrategyEvaluator:
         self.r = risk_free_rate
         self.sigma = volatility
         self.pricer = OptionPricer()
+        # Grille de spots partagée par max gain/loss, break-evens et probabilité
+        self.spot_grid = np.linspace(90, 105, 1000)
+        # Cache par instance: S0, r et sigma sont fixés pour la durée de vie de l'évaluateur
+        self._cached_price = lru_cache(maxsize=None)(self._price)
     
-    def price_option(self, leg: OptionLeg) -> float:
-        """Prix une option"""
-        T = leg.expiry_days / 365.0
+    def _price(self, option_type: str, strike: float, expiry_days: int) -> float:
+        """Prix Black-Scholes d'une option via OptionPricer (appelé une fois par clé)"""
+        T = expiry_days / 365.0
         
-        if leg.option_type.lower() == 'call':
-            return self.pricer.black_scholes_call(self.S0, leg.strike, T, self.r, self.sigma)
-        else:
-            return self.pricer.black_scholes_put(self.S0, leg.strike, T, self.r, self.sigma)
+        if option_type == 'call':
+            return self.pricer.black_scholes_call(self.S0, strike, T, self.r, self.sigma)
+        return self.pricer.black_scholes_put(self.S0, strike, T, self.r, self.sigma)
+    
+    def price_option(self, leg: OptionLeg) -> float:
+        """Prix une option (mémoïsé sur (type, strike, échéance))"""
+        return self._cached_price(leg.option_type.lower(), leg.strike, leg.expiry_days)
     
     def calculate_strategy_cost(self, legs: List[OptionLeg]) -> float:
         """Calcule le coût net de la stratégie"""
@@ -92,41 +128,37 @@ class StrategyEvaluator:
         
         return total_cost
     
-    def calculate_payoff(self, legs: List[OptionLeg], spot_price: float) -> float:
-        """Calcule le payoff à un prix spot donné"""
-        total_payoff = 0
+    @staticmethod
+    def leg_arrays(legs: List[OptionLeg]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Jambes -> tableaux (strikes, quantités signées buy=+/sell=-, is_call)"""
+        strikes = np.array([leg.strike for leg in legs], dtype=float)
+        signed_qty = np.array([leg.quantity if leg.action.lower() == 'buy' else -leg.quantity
+                               for leg in legs], dtype=float)
+        is_call = np.array([leg.option_type.lower() == 'call' for leg in legs])
+        return strikes, signed_qty, is_call
+    
+    def calculate_payoff(self, legs: List[OptionLeg], spot_price):
+        """Calcule le payoff à un prix spot donné (scalaire ou tableau de spots)"""
+        strikes, signed_qty, is_call = self.leg_arrays(legs)
+        spots = np.asarray(spot_price, dtype=float)[..., None]
         
-        for leg in legs:
-            if leg.option_type.lower() == 'call':
-                intrinsic = max(spot_price - leg.strike, 0)
-            else:  # put
-                intrinsic = max(leg.strike - spot_price, 0)
-            
-            if leg.action.lower() == 'buy':
-                total_payoff += intrinsic * leg.quantity
-            else:  # sell
-                total_payoff -= intrinsic * leg.quantity
+        call_intrinsic = np.maximum(spots - strikes, 0.0)
+        put_intrinsic = np.maximum(strikes - spots, 0.0)
+        intrinsic = np.where(is_call, call_intrinsic, put_intrinsic)
         
-        return total_payoff
+        payoff = (intrinsic * signed_qty).sum(axis=-1)
+        return float(payoff) if payoff.ndim == 0 else payoff
     
-    def find_breakeven_points(self, legs: List[OptionLeg], 
-                            strategy_cost: float) -> List[float]:
-        """Trouve les points de break-even"""
-        spot_range = np.linspace(90, 105, 1000)
-        breakevens = []
-        
-        for i, spot in enumerate(spot_range[:-1]):
-            payoff_current = self.calculate_payoff(legs, spot)
-            payoff_next = self.calculate_payoff(legs, spot_range[i+1])
-            
-            pnl_current = payoff_current - strategy_cost
-            pnl_next = payoff_next - strategy_cost
-            
-            # Changement de signe = breakeven
-            if pnl_current * pnl_next < 0:
-                breakevens.append(spot)
+    @staticmethod
+    def breakevens_from_grid(spot_range: np.ndarray, pnl: np.ndarray) -> List[float]:
+        """Break-evens d'un P&L déjà évalué sur une grille (interpolation linéaire)"""
+        # Changement de signe = breakeven
+        idx = np.nonzero(pnl[:-1] * pnl[1:] < 0)[0]
+        x0, x1 = spot_range[idx], spot_range[idx + 1]
+        y0, y1 = pnl[idx], pnl[idx + 1]
+        breakevens = x0 - y0 * (x1 - x0) / (y1 - y0)
         
-        return breakevens
+        return breakevens.tolist()
     
     def evaluate_strategy(self, name: str, legs: List[OptionLeg]) -> StrategyMetrics:
         """Évalue une stratégie complète"""
@@ -138,17 +170,11 @@ class StrategyEvaluator:
         payoff_at_target = self.calculate_payoff(legs, self.target)
         pnl_at_target = payoff_at_target - cost
         
-        # 3. Max gain/loss sur une plage de prix
-        spot_range = np.linspace(90, 105, 500)
-        pnls = []
-        
-        for spot in spot_range:
-            payoff = self.calculate_payoff(legs, spot)
-            pnl = payoff - cost
-            pnls.append(pnl)
+        # 3. Max gain/loss sur une plage de prix (grille unique, réutilisée en 5 et 6)
+        pnls = self.calculate_payoff(legs, self.spot_grid) - cost
         
-        max_gain = max(pnls)
-        max_loss = min(pnls)
+        max_gain = float(pnls.max())
+        max_loss = float(pnls.min())
         
         # 4. Risk/Reward Ratio
         if max_loss != 0:
@@ -157,11 +183,10 @@ class StrategyEvaluator:
             risk_reward_ratio = float('inf') if pnl_at_target > 0 else 0
         
         # 5. Points de break-even
-        breakeven_points = self.find_breakeven_points(legs, cost)
+        breakeven_points = self.breakevens_from_grid(self.spot_grid, pnls)
         
         # 6. Probabilité de break-even (approximation)
-        profitable_scenarios = sum(1 for pnl in pnls if pnl > 0)
-        breakeven_probability = profitable_scenarios / len(pnls)
+        breakeven_probability = float(np.mean(pnls > 0))
         
         return StrategyMetrics(
             name=name,
@@ -200,12 +225,7 @@ def plot_strategy_comparison(evaluator: StrategyEvaluator,
     # Graphique 1: P&L par stratégie
     for i, (name, legs) in enumerate(strategies.items()):
         cost = evaluator.calculate_strategy_cost(legs)
-        pnls = []
-        
-        for spot in spot_range:
-            payoff = evaluator.calculate_payoff(legs, spot)
-            pnl = payoff - cost
-            pnls.append(pnl)
+        pnls = evaluator.calculate_payoff(legs, spot_range) - cost
         
         ax1.plot(spot_range, pnls, label=name, color=colors[i], linewidth=2)
     